@@ -1,12 +1,196 @@
+import base64
+import hashlib
+import json
 import os
 import re
+import time
+from pathlib import Path
+from urllib.parse import urlparse
 
 import pytest
 from dotenv import load_dotenv
 from playwright.sync_api import sync_playwright
 
+from utils import FILE_NAME, log_in
+
 load_dotenv()
 
+# Actions and navigations give up after 10s unless a test asks for longer (Playwright's
+# default is 30s); expect() assertions keep Playwright's own 5s default.
+DEFAULT_TIMEOUT = 10000
+
+# Saved login states, caches and the test PDF all live at the repository root.
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Each pytest-xdist worker runs its own session; outside xdist this is "gw0".
+WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+# Run headless unless HEADLESS=0 is set for local debugging.
+HEADLESS = os.getenv("HEADLESS", "1") == "1"
+
+# Keep Chromium's footprint small in containerized runners.
+CHROMIUM_ARGS = ["--disable-dev-shm-usage", "--disable-gpu", "--no-sandbox"]
+
+# Saved login state younger than this (in seconds) is reused instead of logging in again.
+STORAGE_STATE_TTL = int(os.getenv("STORAGE_STATE_TTL", "3600"))
+
+# In CI a long-lived login state is written from a secret before the run, either one per
+# worker (logged_in_ci_<worker>.json) or a single one shared by all workers (logged_in.json).
+CI_STORAGE_STATE = REPO_ROOT / "logged_in.json"
+
+# Requests the tests never assert on; aborting them shortens page loads.
+THIRD_PARTY_HOSTS = (
+    "google-analytics",
+    "googletagmanager",
+    "segment.io",
+    "intercom",
+    "sentry.io",
+    "hotjar",
+)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Fingerprinted static assets are served from here after the first fetch.
+STATIC_CACHE_DIR = REPO_ROOT / ".cache_static"
+# Bundlers put a content hash right before the extension: Vite an 8-character base64url
+# segment ("index-BxKaQwEr.js"), webpack 8+ hex digits ("main.3f2a1b4c.js", "2.e1f2a3b4.chunk.js").
+# An all-lowercase 8-letter segment ("app-overview.js") is a plain word, not a Vite hash.
+FINGERPRINTED_ASSET_RE = re.compile(
+    r"(?:-(?![a-z]{8}\.)[A-Za-z0-9_-]{8}|\.[0-9a-f]{8,}(?:\.chunk)?)\.(?:js|css|woff2|png)$"
+)
+# Cached assets are refetched after this many seconds, bounding the damage of a misdetected name.
+STATIC_CACHE_TTL = int(os.getenv("STATIC_CACHE_TTL", "86400"))
+# Headers that describe the bytes on the wire, not the decoded body we store.
+UNCACHED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _is_ci():
+    """Return True when running in CI (CI=1/true/yes, as most CI systems set it)."""
+    return os.getenv("CI", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _ci_storage_state(worker):
+    """Return the CI-provided login state for a worker: its own if present, else the shared one."""
+    own = REPO_ROOT / f"logged_in_ci_{worker}.json"
+    if own.exists():
+        return own
+    if CI_STORAGE_STATE.exists():
+        return CI_STORAGE_STATE
+    return None
+
+
+def _has_own_account(worker):
+    """Return True if the given xdist worker has a dedicated account configured."""
+    if _is_ci():
+        ci_storage_state = _ci_storage_state(worker)
+        if ci_storage_state is not None:
+            # The shared CI state is one account for every worker
+            return ci_storage_state != CI_STORAGE_STATE
+    return bool(os.getenv(f"EMAIL_{worker.upper()}"))
+
+
+def _is_fresh(path, ttl=STORAGE_STATE_TTL):
+    """Return True if the file (by default a saved login state) exists and is younger than `ttl` seconds."""
+    path = Path(path)
+    return path.exists() and time.time() - path.stat().st_mtime < ttl
+
+
+def _new_context(browser, **kwargs):
+    """Create a browser context with the suite's default action timeout."""
+    context = browser.new_context(**kwargs)
+    context.set_default_timeout(DEFAULT_TIMEOUT)
+    return context
+
+
+def _is_signed_in(context, base_url):
+    """Return True if the context's session still opens the upload page instead of redirecting to login."""
+    page = context.new_page()
+    page.goto(f"{base_url}upload")
+    # Either page settles first: the upload page's heading, or the login form after a redirect
+    page.get_by_role("heading", name="Chat").or_(page.get_by_role("button", name="Sign in")).first.wait_for()
+    signed_in = not urlparse(page.url).path.startswith("/login")
+    page.close()
+    return signed_in
+
+
+def _load_signed_in(browser, base_url, storage_state):
+    """Load a saved login state into a new context, or return None if its session was revoked."""
+    context = _new_context(browser, storage_state=storage_state)
+    if _is_signed_in(context, base_url):
+        return context
+    context.close()
+    return None
+
+
+def _block_non_essential(route):
+    """Abort third-party and media requests, let everything else through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in THIRD_PARTY_HOSTS
+    ):
+        route.abort()
+    else:
+        route.fallback()
+
+
+def _cache_static(route):
+    """Serve fingerprinted static assets from the on-disk cache, storing them on a miss.
+
+    Assets without a content hash in their filename may change on deploy, so they
+    always go to the network.
+    """
+    request = route.request
+    if request.method != "GET" or not FINGERPRINTED_ASSET_RE.search(urlparse(request.url).path):
+        route.fallback()
+        return
+
+    cached = STATIC_CACHE_DIR / f"{hashlib.md5(request.url.encode()).hexdigest()}.json"
+    if _is_fresh(cached, STATIC_CACHE_TTL):
+        entry = json.loads(cached.read_text())
+        route.fulfill(
+            status=entry["status"],
+            headers=entry["headers"],
+            body=base64.b64decode(entry["body"]),
+        )
+        return
+
+    response = route.fetch()
+    if response.ok:
+        entry = {
+            "status": response.status,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in UNCACHED_HEADERS
+            },
+            "body": base64.b64encode(response.body()).decode(),
+        }
+        # Write to a per-worker temp file first so other workers never read a partial asset
+        STATIC_CACHE_DIR.mkdir(exist_ok=True)
+        partial = cached.with_suffix(f".{WORKER}.tmp")
+        partial.write_text(json.dumps(entry))
+        partial.replace(cached)
+    route.fulfill(response=response)
+
+
+# Must run before xdist's own hook, which turns xdist_group markers into node ID suffixes
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    """Keep each account-mutating class on one worker, and all of them together on a shared account.
+
+    Under `--dist=loadgroup` every class marked `mutates_account` becomes its own
+    xdist group. If any worker would fall back to the shared EMAIL account, they
+    all go into a single group instead, so they run one after another and never
+    race on the same account's files or workspaces.
+    """
+    workerinput = getattr(config, "workerinput", None)
+    workers = [f"gw{i}" for i in range(workerinput["workercount"])] if workerinput else []
+    shared = not all(_has_own_account(worker) for worker in workers)
+
+    for item in items:
+        if item.get_closest_marker("mutates_account"):
+            group = "shared-account" if shared else item.nodeid.rsplit("::", 1)[0]
+            item.add_marker(pytest.mark.xdist_group(group))
+
 
 @pytest.fixture(scope="session", autouse=True)
 def base_url():
@@ -15,50 +199,105 @@ def base_url():
 
 @pytest.fixture(scope="session")
 def email():
-    return os.getenv("EMAIL")
+    """Account for this worker (EMAIL_GW0, EMAIL_GW1, ...), falling back to EMAIL."""
+    return os.getenv(f"EMAIL_{WORKER.upper()}", os.getenv("EMAIL"))
 
 
 @pytest.fixture(scope="session")
 def password():
-    return os.getenv("PASSWORD")
+    """Password for this worker's account, falling back to PASSWORD."""
+    return os.getenv(f"PASSWORD_{WORKER.upper()}", os.getenv("PASSWORD"))
+
+
+@pytest.fixture(scope="session")
+def storage_state_path():
+    """Per-worker file holding the saved login state."""
+    return REPO_ROOT / f"logged_in_{WORKER}.json"
 
 
 @pytest.fixture(scope="session")
 def browser_context():
     """Launch a single browser for the test session."""
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
+        browser = p.chromium.launch(headless=HEADLESS, args=CHROMIUM_ARGS)
         context = browser.new_context()
         yield context
         browser.close()
 
 
 @pytest.fixture(scope="session")
-def authenticated_context(browser_context, base_url, email, password):
-    """Log in once per session and reuse the authenticated session."""
-    page = browser_context.new_page()
-    page.goto(f"{base_url}login")
+def authenticated_context(browser_context, base_url, email, password, storage_state_path):
+    """Log in once per session and reuse the authenticated session.
+
+    A login state provided by CI, or a saved one that is still fresh, is loaded
+    into a new context, skipping the UI login and 2FA step. Either is skipped if
+    its session was revoked server-side (e.g. by signing out), and a revoked
+    saved state is deleted. Otherwise the login runs in `browser_context`, which
+    is then used as-is; its state is saved as soon as the login succeeds so
+    later runs can reuse it.
+    """
+    context = None
+    ci_storage_state = _ci_storage_state(WORKER) if _is_ci() else None
+    if ci_storage_state:
+        context = _load_signed_in(browser_context.browser, base_url, ci_storage_state)
+    if context is None and _is_fresh(storage_state_path):
+        context = _load_signed_in(browser_context.browser, base_url, storage_state_path)
+        if context is None:
+            storage_state_path.unlink()
+    if context is None:
+        context = browser_context
+
+    context.set_default_timeout(DEFAULT_TIMEOUT)
+
+    # Routes run newest first: blocked requests are aborted before the cache sees them
+    context.route("**/*.{js,css,woff2,png}", _cache_static)
+    context.route("**/*", _block_non_essential)
+
+    # Accept confirmation dialogs (e.g. delete prompts) on every page in the context
+    context.on("page", lambda page: page.on("dialog", lambda dialog: dialog.accept()))
+
+    if context is browser_context:
+        page = context.new_page()
+        log_in(page, base_url, email, password)
+        page.close()
 
-    # Fill login form
-    page.get_by_role("textbox", name="Username, Email or Phone").fill(email)
-    page.get_by_placeholder("Email").fill(email)
-    page.get_by_placeholder("Password").fill(password)
-    page.locator("div").filter(has_text=re.compile(r"^Remember me$")).click()
+        # Save authentication state for later runs
+        context.storage_state(path=storage_state_path)
 
-    page.get_by_role("button", name="Sign in").click()
+    yield context
 
-    page.get_by_role("textbox", name="Enter 6-digit code").fill("335577")
-    page.get_by_role("button", name="Verify Code").click()
+    if context is not browser_context:
+        context.close()
 
-    # Wait for dashboard to confirm successful login.
-    page.wait_for_url(re.compile(r".*/upload"), timeout=90000)
 
-    # Save authentication state
-    storage_state_path = "logged_in.json"
-    browser_context.storage_state(path=storage_state_path)
+@pytest.fixture
+def new_context(browser_context):
+    """Factory for extra browser contexts with the default timeout, closed after the test."""
+    contexts = []
+
+    def factory(**kwargs):
+        context = _new_context(browser_context.browser, **kwargs)
+        contexts.append(context)
+        return context
+
+    yield factory
+    for context in contexts:
+        context.close()
+
+
+@pytest.fixture
+def page(authenticated_context):
+    """Open a fresh page in the authenticated context for a single test."""
+    page = authenticated_context.new_page()
+    yield page
     page.close()
 
-    # Create a new context with saved state
-    new_context = browser_context.browser.new_context(storage_state=storage_state_path)
-    yield new_context
-    new_context.close()
+
+@pytest.fixture(scope="session")
+def test_pdf():
+    """The test PDF as a `set_input_files` payload, read from disk once per session."""
+    return {
+        "name": f"{FILE_NAME}.pdf",
+        "mimeType": "application/pdf",
+        "buffer": (REPO_ROOT / f"{FILE_NAME}.pdf").read_bytes(),
+    }
@@ -3,8 +3,12 @@ import re
 import pytest
 from playwright.sync_api import expect
 
+from utils import goto_upload, log_in
 
-def test_login_success(authenticated_context, base_url):
+SIGN_IN_RE = re.compile(r"sign in", re.I)
+
+
+def test_login_success(page, base_url):
     """
     Verify that an authenticated user can successfully access the upload page.
 
@@ -13,16 +17,13 @@ def test_login_success(authenticated_context, base_url):
         2. Navigate to the upload page.
         3. Assert that the 'Chat' heading is visible, confirming successful login.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    goto_upload(page, base_url)
 
     # Assert that the user is logged in and on the correct page
     expect(page.get_by_role("heading", name="Chat")).to_be_visible()
 
-    page.close()
-
 
-def test_remember_me(authenticated_context, base_url):
+def test_remember_me(page, base_url):
     """
     Verify that the 'Remember me' functionality behaves as expected
     (currently expected to fail due to an unimplemented feature).
@@ -36,7 +37,6 @@ def test_remember_me(authenticated_context, base_url):
         6. Wait shortly for UI updates.
         7. Verify that 'No trusted devices' heading is not visible (expected to fail).
     """
-    page = authenticated_context.new_page()
     page.goto(f"{base_url}settings")
 
     # Confirm navigation to the Settings page
@@ -52,22 +52,23 @@ def test_remember_me(authenticated_context, base_url):
     # This is an expected failure placeholder until feature is functional
     expect(page.get_by_role("heading", name="No trusted devices")).not_to_be_visible()
 
-    page.close()
-
 
 @pytest.mark.order("last")
-def test_logout_success(authenticated_context, base_url):
+def test_logout_success(new_context, base_url, email, password):
     """
     Verify that a logged-in user can successfully log out.
 
     Steps:
-        1. Navigate to the upload page using an authenticated context.
+        1. Log in through the UI in a new context and open the upload page.
         2. Open the user menu and click 'Sign out'.
         3. Confirm the user is redirected to the login page.
         4. Verify that the login form is visible again.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    # Sign out of a session of its own, so the shared (or CI-provided) one is never revoked
+    context = new_context()
+    page = context.new_page()
+    log_in(page, base_url, email, password)
+    goto_upload(page, base_url)
 
     # Perform logout
     page.get_by_role("button", name="GM").click()
@@ -77,12 +78,10 @@ def test_logout_success(authenticated_context, base_url):
     expect(page).to_have_url(f"{base_url}login")
 
     # Confirm login form is visible
-    expect(page.get_by_role("button", name=re.compile("sign in", re.I))).to_be_visible()
-
-    page.close()
+    expect(page.get_by_role("button", name=SIGN_IN_RE)).to_be_visible()
 
 
-def test_logout_incorrect_password(browser_context, base_url, email, password):
+def test_logout_incorrect_password(new_context, base_url, email, password):
     """
     Verify that login fails when provided with an incorrect password.
 
@@ -93,21 +92,21 @@ def test_logout_incorrect_password(browser_context, base_url, email, password):
         4. Submit the form.
         5. Verify that the 'Login failed' message appears.
     """
-    page = browser_context.new_page()
+    # Use a fresh, signed-out context so the failed login cannot touch the shared session
+    context = new_context()
+    page = context.new_page()
     page.goto(f"{base_url}login")
 
     # Fill in login credentials
-    page.get_by_role("textbox", name="Username, Email or Phone").fill(email)
+    page.get_by_placeholder("Username, Email or Phone").fill(email)
     page.get_by_placeholder("Email").fill("some_email@gmail.com")
     page.get_by_placeholder("Password").fill(password)
 
     # Click the 'Remember me' checkbox
-    page.locator("div").filter(has_text=re.compile(r"^Remember me$")).click()
+    page.get_by_text("Remember me", exact=True).click()
 
     # Submit the login form
     page.get_by_role("button", name="Sign in").click()
 
     # Validate that a login failure message appears
     expect(page.get_by_text("Login failed. Please check")).to_be_visible()
-
-    page.close()
@@ -1,136 +1,121 @@
 import re
 
+import pytest
 from playwright.sync_api import Page, expect
 
+from utils import FILE_NAME, goto_upload
 
-FILE_NAME = "Grabdocs Test Plan"
 
+ASK_ANYTHING_RE = re.compile(r"Ask anything", re.I)
+SEND_RE = re.compile(r"Send message", re.I)
 
-def test_file_upload(authenticated_context, base_url):
-    """
-    Test Case: Upload a File
-
-    Objective:
-        Verify that a user can successfully upload a PDF file.
 
-    Steps:
-        1. Open the 'Upload' page using an authenticated session.
-        2. Confirm that the 'Chat' heading is visible (indicating correct page).
-        3. Verify that no files are uploaded initially (placeholder message shown).
-        4. Upload a test file (e.g., 'Grabdocs Test Plan.pdf').
-        5. Wait for the upload process to complete.
-        6. Validate that the uploaded file appears in the list.
-
-    Expected Result:
-        The uploaded file should appear, and the "No documents uploaded yet" message should disappear.
-    """
+@pytest.fixture(scope="class")
+def uploaded_file(authenticated_context, base_url, test_pdf):
+    """Upload the test document on the chat page once for the document tests and remove it afterwards."""
     page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
-
-    # Ensure the upload page is loaded
-    expect(page.get_by_role("heading", name="Chat")).to_be_visible()
+    goto_upload(page, base_url, verify=True)
 
-    # Confirm initial state — no files present
+    # Confirm initial state — no documents present
     expect(page.get_by_text("No documents uploaded yet")).to_be_visible()
 
-    # Upload a sample file
-    page.set_input_files("input[type='file']", f"{FILE_NAME}.pdf")
-
-    # Allow some time for the upload to complete
-    page.wait_for_timeout(10000)
-
-    # Verify that the uploaded file name appears
-    expect(page.get_by_text(FILE_NAME)).to_be_visible(timeout=10000)
-
+    # Upload the document and wait for it to appear
+    page.set_input_files("input[type='file']", files=[test_pdf])
+    expect(page.get_by_text(FILE_NAME)).to_be_visible(timeout=20000)
     page.close()
 
+    yield FILE_NAME
 
-def test_file_download(authenticated_context, base_url):
-    """
-    Test Case: Download a File
-
-    Objective:
-        Verify that a user can download an uploaded file successfully.
+    # Clean up in case the document tests stopped before the delete test
+    page = authenticated_context.new_page()
+    goto_upload(page, base_url)
 
-    Steps:
-        1. Open the 'Upload' page with an authenticated session.
-        2. Ensure that the test file ('Grabdocs Test Plan.pdf') is visible.
-        3. Expand the file item action menu.
-        4. Click the 'Download' button.
-        5. Wait for the browser to trigger a file download event.
+    # Wait for the list to render: either our document or the empty state
+    document = page.get_by_role("listitem").filter(has_text=FILE_NAME)
+    expect(document.or_(page.get_by_text("No documents uploaded yet")).first).to_be_visible()
 
-    Expected Result:
-        The download should start successfully (Playwright detects the download event).
-    """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    if document.count():
+        document.get_by_role("button").click()
+        page.get_by_role("button", name="Delete").click()
+        expect(document).not_to_be_visible()
+    expect(page.get_by_text("No documents uploaded yet")).to_be_visible()
+    page.close()
 
-    # Validate correct page load
-    expect(page.get_by_role("heading", name="Chat")).to_be_visible()
 
-    # Ensure uploaded file is visible
-    expect(page.get_by_text(FILE_NAME)).to_be_visible()
+@pytest.mark.mutates_account
+class TestChatDocuments:
+    """Download and delete the uploaded document on the chat page, in order."""
 
-    # Open file action menu
-    page.get_by_role("listitem").get_by_role("button").click()
+    def test_file_download(self, page, base_url, uploaded_file):
+        """
+        Test Case: Download a File
 
-    # Expect browser download event when button clicked
-    with page.expect_download() as download_info:
-        page.get_by_role("button", name="Download").click()
+        Objective:
+            Verify that a user can download an uploaded file successfully.
 
-    download = download_info.value
-    assert download.suggested_filename.endswith(".pdf"), "Downloaded file should be a PDF"
+        Steps:
+            1. Open the 'Upload' page with an authenticated session.
+            2. Ensure that the test file ('Grabdocs Test Plan.pdf') is visible.
+            3. Expand the file item action menu.
+            4. Click the 'Download' button.
+            5. Wait for the browser to trigger a file download event.
 
-    page.close()
+        Expected Result:
+            The download should start successfully (Playwright detects the download event).
+        """
+        goto_upload(page, base_url)
 
+        # Ensure uploaded file is visible
+        expect(page.get_by_text(uploaded_file)).to_be_visible()
 
-def test_file_delete(authenticated_context, base_url):
-    """
-    Test Case: Delete a File
+        # Open file action menu
+        page.get_by_role("listitem").get_by_role("button").click()
 
-    Objective:
-        Verify that a user can delete a previously uploaded file.
+        # Expect browser download event when button clicked
+        with page.expect_download() as download_info:
+            page.get_by_role("button", name="Download").click()
 
-    Steps:
-        1. Navigate to the 'Upload' page using an authenticated session.
-        2. Confirm that the uploaded file is visible.
-        3. Open the file action menu.
-        4. Click 'Delete' and accept the confirmation dialog.
-        5. Wait for the success alert to appear.
-        6. Confirm that the page displays the 'No documents uploaded yet' message again.
+        download = download_info.value
+        assert download.suggested_filename.endswith(".pdf"), "Downloaded file should be a PDF"
 
-    Expected Result:
-        The success alert message appears, and the file entry disappears from the list.
-    """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    def test_file_delete(self, page, base_url, uploaded_file):
+        """
+        Test Case: Delete a File
 
-    # Ensure the upload page is visible
-    expect(page.get_by_role("heading", name="Chat")).to_be_visible()
+        Objective:
+            Verify that a user can delete a previously uploaded file.
 
-    # Verify that the uploaded file is available
-    expect(page.get_by_text(FILE_NAME)).to_be_visible()
+        Steps:
+            1. Navigate to the 'Upload' page using an authenticated session.
+            2. Confirm that the uploaded file is visible.
+            3. Open the file action menu.
+            4. Click 'Delete' and accept the confirmation dialog.
+            5. Wait for the success alert to appear.
+            6. Confirm that the page displays the 'No documents uploaded yet' message again.
 
-    # Open file action menu
-    page.get_by_role("listitem").get_by_role("button").click()
+        Expected Result:
+            The success alert message appears, and the file entry disappears from the list.
+        """
+        goto_upload(page, base_url)
 
-    # Accept the delete confirmation dialog
-    page.once("dialog", lambda dialog: dialog.accept())
+        # Verify that the uploaded file is available
+        expect(page.get_by_text(uploaded_file)).to_be_visible()
 
-    # Click delete button
-    page.get_by_role("button", name="Delete").click()
+        # Open file action menu
+        page.get_by_role("listitem").get_by_role("button").click()
 
-    # Confirm success alert appears
-    alert = page.get_by_role("alert").filter(has_text="successfully")
-    expect(alert).to_be_visible(timeout=8000)
+        # Click delete button (the confirmation dialog is accepted by the context)
+        page.get_by_role("button", name="Delete").click()
 
-    # Verify that the placeholder message is now visible again
-    expect(page.get_by_text("No documents uploaded yet")).to_be_visible()
+        # Confirm success alert appears (the delete round-trips to the backend, so allow more than the 5s default)
+        alert = page.get_by_role("alert").filter(has_text="successfully")
+        expect(alert).to_be_visible(timeout=8000)
 
-    page.close()
+        # Verify that the placeholder message is now visible again
+        expect(page.get_by_text("No documents uploaded yet")).to_be_visible()
 
 
-def test_bookmarks(authenticated_context, base_url):
+def test_bookmarks(page, base_url):
     """
     Test Case: Toggle 'Bookmarks' Panel
 
@@ -147,15 +132,13 @@ def test_bookmarks(authenticated_context, base_url):
     Expected Result:
         The 'Bookmarks' section toggles visibility correctly.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    goto_upload(page, base_url)
 
     # Validate initial hidden state
     expect(page.get_by_role("heading", name="Bookmarks")).not_to_be_visible()
 
     # Show bookmarks
     page.get_by_role("button", name="Show Bookmarks").click()
-    page.wait_for_timeout(1000)
 
     # Confirm bookmarks section visible
     expect(page.get_by_role("heading", name="Bookmarks")).to_be_visible()
@@ -165,10 +148,8 @@ def test_bookmarks(authenticated_context, base_url):
     page.get_by_role("button", name="Hide Bookmarks").click()
     expect(page.get_by_role("heading", name="Bookmarks")).not_to_be_visible()
 
-    page.close()
 
-
-def test_reference(authenticated_context, base_url):
+def test_reference(page, base_url):
     """
     Test Case: Toggle 'References' Panel
 
@@ -185,15 +166,13 @@ def test_reference(authenticated_context, base_url):
     Expected Result:
         The 'References' section toggles visibility correctly.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    goto_upload(page, base_url)
 
     # Check initial hidden state
     expect(page.get_by_role("heading", name="References")).not_to_be_visible()
 
     # Show references section
     page.get_by_role("button", name="Show References").click()
-    page.wait_for_timeout(1000)
 
     expect(page.get_by_role("heading", name="References")).to_be_visible()
     expect(page.get_by_role("button", name="Hide References")).to_be_visible()
@@ -202,10 +181,8 @@ def test_reference(authenticated_context, base_url):
     page.get_by_role("button", name="Hide References").click()
     expect(page.get_by_role("heading", name="References")).not_to_be_visible()
 
-    page.close()
 
-
-def test_history(authenticated_context, base_url):
+def test_history(page, base_url):
     """
     Test Case: Toggle 'Chat History' Panel
 
@@ -222,15 +199,13 @@ def test_history(authenticated_context, base_url):
     Expected Result:
         The 'Chat History' section toggles visibility correctly.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    goto_upload(page, base_url)
 
     # Validate initial hidden state
     expect(page.get_by_role("heading", name="Chat History")).not_to_be_visible()
 
     # Show chat history section
     page.get_by_role("button", name="Show History").click()
-    page.wait_for_timeout(1000)
 
     # Confirm visibility
     expect(page.get_by_role("heading", name="Chat History")).to_be_visible()
@@ -240,10 +215,8 @@ def test_history(authenticated_context, base_url):
     page.get_by_role("button", name="Hide History").click()
     expect(page.get_by_role("heading", name="Chat History")).not_to_be_visible()
 
-    page.close()
-
 
-def test_chat(authenticated_context, base_url):
+def test_chat(page, base_url):
     """
     Test Case: Send and Receive a Chat Message
 
@@ -261,22 +234,16 @@ def test_chat(authenticated_context, base_url):
     Expected Result:
         After sending a message, the system-generated 'GD' response is displayed.
     """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}upload")
+    goto_upload(page, base_url)
 
     # Confirm that no earlier messages (GD responses) exist
     expect(page.get_by_text("GD")).not_to_be_visible()
 
     # Type and send a chat message
-    page.get_by_role("textbox", name=re.compile("Ask anything", re.I)).fill(
+    page.get_by_role("textbox", name=ASK_ANYTHING_RE).fill(
         "Why is file upload failing?"
     )
-    page.get_by_role("button", name=re.compile("Send message", re.I)).click()
-
-    # Wait briefly for a system response
-    page.wait_for_timeout(1000)
+    page.get_by_role("button", name=SEND_RE).click()
 
     # Verify the presence of a response (GD)
-    expect(page.get_by_text("GD")).to_be_visible()
-
-    page.close()
\ No newline at end of file
+    expect(page.get_by_text("GD")).to_be_visible(timeout=10000)
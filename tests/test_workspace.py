@@ -1,169 +1,187 @@
-import re
-
+import pytest
 from playwright.sync_api import expect
 
 WORK_SPACE_NAME = "Test workspace"
 TEST_EMAIL = "test@gmail.com"
 
-def test_workspace_create(authenticated_context, base_url):
-    """
-    Test Case: Create a New Workspace
-
-    Objective:
-        Verify that a user can successfully create a new workspace.
-
-    Precondition:
-        The user must be logged in (authenticated session).
-
-    Steps:
-        1. Navigate to the 'Workspaces' page.
-        2. Validate presence of the main 'Workspaces' heading.
-        3. Ensure no existing 'Team Workspaces' section is visible initially.
-        4. Open the workspace creation dialog.
-        5. Fill in workspace name and description.
-        6. Submit the creation form.
-        7. Wait for the workspace list to refresh.
-        8. Confirm the new workspace appears under 'Team Workspaces'.
-
-    Expected Result:
-        A newly created workspace should be displayed under 'Team Workspaces'.
-    """
+
+def _is_workspace_list(response):
+    """Match the API call that loads the workspaces list, not the /workspaces page itself."""
+    request = response.request
+    return (
+        request.method == "GET"
+        and request.resource_type in ("fetch", "xhr")
+        and "workspaces" in response.url
+    )
+
+
+def _workspace_card(page, name):
+    """Innermost element holding both the named workspace and its 'Delete Workspace' button."""
+    return (
+        page.locator("div")
+        .filter(has=page.get_by_role("heading", name=name))
+        .filter(has=page.get_by_text("Delete Workspace", exact=True))
+        .last
+    )
+
+
+@pytest.fixture(scope="class")
+def workspace(authenticated_context, base_url):
+    """Create the test workspace once for the lifecycle tests and remove it afterwards."""
     page = authenticated_context.new_page()
     page.goto(f"{base_url}workspaces")
 
-    # Verify navigation to the "Workspaces" page
-    expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
-
     # Ensure there are no existing team workspaces
+    expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
     expect(page.get_by_role("heading", name="Team Workspaces")).not_to_be_visible()
 
-    # Open workspace creation modal
+    # Open workspace creation modal and fill in the form
     page.get_by_role("button", name="Create Workspace").click()
+    page.get_by_placeholder("Enter workspace name").fill(WORK_SPACE_NAME)
+    page.get_by_placeholder("Enter workspace description").fill("Testing workspace")
 
-    # Fill in workspace form fields
-    page.get_by_role("textbox", name="Enter workspace name").fill(WORK_SPACE_NAME)
-    page.get_by_role("textbox", name="Enter workspace description").fill("Testing workspace")
-
-    # Submit the form to create the workspace
+    # Submit the form and wait for the workspace to appear
     page.get_by_role("button", name="Create", exact=True).click()
-
-    # Wait briefly for UI updates / refresh
-    page.wait_for_timeout(1000)
-
-    # Validate that the new workspace appears under "Team Workspaces"
-    expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
     expect(page.get_by_role("heading", name=WORK_SPACE_NAME)).to_be_visible()
-
     page.close()
 
+    yield WORK_SPACE_NAME
 
-def test_workspace_invite(authenticated_context, base_url):
-    """
-    Test Case: Invite a User to an Existing Workspace
+    # Clean up in case the lifecycle stopped before the delete test
+    page = authenticated_context.new_page()
+    # The page has no empty-state placeholder, so wait for the list itself to load
+    with page.expect_response(_is_workspace_list):
+        page.goto(f"{base_url}workspaces")
+    expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
+    expect(page.get_by_role("button", name="Create Workspace")).to_be_visible()
 
-    Objective:
-        Verify that a user can successfully invite other members to a workspace.
+    heading = page.get_by_role("heading", name=WORK_SPACE_NAME)
+    if heading.count():
+        _workspace_card(page, WORK_SPACE_NAME).get_by_text("Delete Workspace", exact=True).click()
+        expect(heading).not_to_be_visible()
+    page.close()
 
-    Precondition:
-        A workspace must already exist (e.g., created by `test_workspace_create`).
 
-    Steps:
-        1. Navigate to the 'Workspaces' page.
-        2. Validate that the workspace and team section are visible.
-        3. Click the 'Invite Member' button.
-        4. Enter one or more email addresses for invitation.
-        5. Send the invitation.
-        6. View sent invitations and verify presence of 'Resend' and 'Cancel' actions.
-        7. Cancel an existing invitation and confirm visual feedback.
+@pytest.mark.mutates_account
+class TestWorkspaceLifecycle:
+    """Create, invite to and delete a single team workspace, in order."""
 
-    Expected Result:
-        Invitations should be listed under the workspace, with visible controls
-        to resend or cancel invitations. After cancellation, an empty-state message appears.
-    """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}workspaces")
+    def test_workspace_create(self, page, base_url, workspace):
+        """
+        Test Case: Create a New Workspace
 
-    # Validate main workspace section visibility
-    expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
-    expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
-    expect(page.get_by_role("heading", name=WORK_SPACE_NAME)).to_be_visible()
+        Objective:
+            Verify that a user can successfully create a new workspace.
 
-    # Open the invitation dialog
-    page.get_by_role("button", name="Invite Member").click()
+        Precondition:
+            The workspace has been created through the creation dialog by the `workspace` fixture.
 
-    # Confirm that the invite modal is displayed
-    expect(page.get_by_role("heading", name=f"Invite to {WORK_SPACE_NAME}")).to_be_visible()
+        Steps:
+            1. Navigate to the 'Workspaces' page.
+            2. Validate presence of the main 'Workspaces' heading.
+            3. Confirm the new workspace appears under 'Team Workspaces'.
 
-    # Enter test email(s) and send invitation
-    page.get_by_role("textbox", name="user1@example.com, user2@").fill(TEST_EMAIL)
-    page.get_by_role("button", name="Send Invitation").click()
+        Expected Result:
+            A newly created workspace should be displayed under 'Team Workspaces'.
+        """
+        page.goto(f"{base_url}workspaces")
 
-    # Wait for system response and UI update
-    page.wait_for_timeout(1000)
+        # Verify navigation to the "Workspaces" page
+        expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
 
-    # View the list of sent invitations
-    page.get_by_role("button", name="View Invitations").click()
+        # Validate that the new workspace appears under "Team Workspaces"
+        expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
+        expect(page.get_by_role("heading", name=workspace)).to_be_visible()
 
-    # Verify invitation management options
-    expect(page.get_by_role("button", name="Resend All")).to_be_visible()
-    expect(page.get_by_role("button", name="Resend Invitation")).to_be_visible()
-    expect(page.get_by_role("heading", name=f"{WORK_SPACE_NAME} Invitations")).to_be_visible()
+    def test_workspace_invite(self, page, base_url, workspace):
+        """
+        Test Case: Invite a User to an Existing Workspace
 
-    # Cancel an existing invitation
-    page.get_by_role("button", name="Cancel Invitation").click()
+        Objective:
+            Verify that a user can successfully invite other members to a workspace.
 
-    # Ensure the no-pending-invitations message appears
-    expect(page.get_by_text("No pending invitations for")).to_be_visible()
+        Precondition:
+            A workspace must already exist (created by the `workspace` fixture).
 
-    # Verify the invitation modal can be dismissed safely
-    page.locator("div").filter(
-        has_text=re.compile(r"^Test workspace Invitations$")
-    ).get_by_role("button").click()
+        Steps:
+            1. Navigate to the 'Workspaces' page.
+            2. Validate that the workspace and team section are visible.
+            3. Click the 'Invite Member' button.
+            4. Enter one or more email addresses for invitation.
+            5. Send the invitation.
+            6. View sent invitations and verify presence of 'Resend' and 'Cancel' actions.
+            7. Cancel an existing invitation and confirm visual feedback.
 
-    page.close()
+        Expected Result:
+            Invitations should be listed under the workspace, with visible controls
+            to resend or cancel invitations. After cancellation, an empty-state message appears.
+        """
+        page.goto(f"{base_url}workspaces")
 
+        # Validate main workspace section visibility
+        expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
+        expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
+        expect(page.get_by_role("heading", name=workspace)).to_be_visible()
 
-def test_workspace_delete(authenticated_context, base_url):
-    """
-    Test Case: Delete an Existing Workspace
+        # Open the invitation dialog
+        page.get_by_text("Invite Member", exact=True).click()
 
-    Objective:
-        Verify that a user can successfully delete a workspace.
+        # Confirm that the invite modal is displayed
+        expect(page.get_by_role("heading", name=f"Invite to {workspace}")).to_be_visible()
 
-    Precondition:
-        At least one workspace (e.g., from `test_workspace_create`) must exist.
+        # Enter test email(s) and send invitation
+        page.get_by_placeholder("user1@example.com, user2@").fill(TEST_EMAIL)
+        page.get_by_text("Send Invitation", exact=True).click()
 
-    Steps:
-        1. Navigate to the 'Workspaces' page.
-        2. Confirm the 'Team Workspaces' section and existing workspace visibility.
-        3. Click the 'Delete Workspace' button.
-        4. Handle the confirmation dialog by accepting it.
-        5. Wait temporarily for any backend operations or UI updates.
-        6. Verify that the deleted workspace and section are no longer displayed.
+        # View the list of sent invitations
+        page.get_by_role("button", name="View Invitations").click()
 
-    Expected Result:
-        The workspace should be removed from the UI and 'Team Workspaces'
-        should no longer be visible.
-    """
-    page = authenticated_context.new_page()
-    page.goto(f"{base_url}workspaces")
+        # Verify invitation management options
+        expect(page.get_by_role("button", name="Resend All")).to_be_visible()
+        expect(page.get_by_role("button", name="Resend Invitation")).to_be_visible()
+        expect(page.get_by_role("heading", name=f"{workspace} Invitations")).to_be_visible()
 
-    # Auto-accept confirmation dialog when deleting a workspace
-    page.on("dialog", lambda dialog: dialog.accept())
+        # Cancel an existing invitation
+        page.get_by_role("button", name="Cancel Invitation").click()
 
-    # Confirm navigation and workspace existence
-    expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
-    expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
-    expect(page.get_by_role("heading", name=WORK_SPACE_NAME)).to_be_visible()
+        # Ensure the no-pending-invitations message appears
+        expect(page.get_by_text("No pending invitations for")).to_be_visible()
 
-    # Initiate workspace deletion
-    page.get_by_role("button", name="Delete Workspace").click()
+        # Verify the invitation modal can be dismissed safely
+        invitations_header = page.get_by_role("heading", name=f"{workspace} Invitations").locator("..")
+        invitations_header.get_by_role("button").click()
 
-    # Wait for the deletion UI process to complete
-    page.wait_for_timeout(1000)
+    def test_workspace_delete(self, page, base_url, workspace):
+        """
+        Test Case: Delete an Existing Workspace
 
-    # Verify that the workspace and related section no longer appear
-    expect(page.get_by_role("heading", name="Team Workspaces")).not_to_be_visible()
-    expect(page.get_by_role("heading", name=WORK_SPACE_NAME)).not_to_be_visible()
+        Objective:
+            Verify that a user can successfully delete a workspace.
+
+        Precondition:
+            A workspace (created by the `workspace` fixture) must exist.
 
-    page.close()
\ No newline at end of file
+        Steps:
+            1. Navigate to the 'Workspaces' page.
+            2. Confirm the 'Team Workspaces' section and existing workspace visibility.
+            3. Click the 'Delete Workspace' button.
+            4. Handle the confirmation dialog by accepting it.
+            5. Verify that the deleted workspace and section are no longer displayed.
+
+        Expected Result:
+            The workspace should be removed from the UI and 'Team Workspaces'
+            should no longer be visible.
+        """
+        page.goto(f"{base_url}workspaces")
+
+        # Confirm navigation and workspace existence
+        expect(page.get_by_role("heading", level=1, name="Workspaces")).to_be_visible()
+        expect(page.get_by_role("heading", name="Team Workspaces")).to_be_visible()
+        expect(page.get_by_role("heading", name=workspace)).to_be_visible()
+
+        # Initiate workspace deletion (the confirmation dialog is accepted by the context)
+        page.get_by_text("Delete Workspace", exact=True).click()
+
+        # Verify that the workspace and related section no longer appear
+        expect(page.get_by_role("heading", name="Team Workspaces")).not_to_be_visible()
+        expect(page.get_by_role("heading", name=workspace)).not_to_be_visible()
@@ -0,0 +1,38 @@
+import re
+
+from playwright.sync_api import expect
+
+# Test document uploaded by the chat and files tests (without its .pdf extension).
+FILE_NAME = "Grabdocs Test Plan"
+
+# Deadline for the dashboard to load after submitting the login form.
+LOGIN_TIMEOUT = 25000
+
+# The app lands on the upload page after a successful login.
+UPLOAD_URL_RE = re.compile(r".*/upload")
+
+
+def log_in(page, base_url, email, password):
+    """Sign in through the login form and 2FA step, waiting for the upload page."""
+    page.goto(f"{base_url}login")
+
+    # Fill login form
+    page.get_by_placeholder("Username, Email or Phone").fill(email)
+    page.get_by_placeholder("Email").fill(email)
+    page.get_by_placeholder("Password").fill(password)
+    page.get_by_text("Remember me", exact=True).click()
+
+    page.get_by_role("button", name="Sign in").click()
+
+    page.get_by_placeholder("Enter 6-digit code").fill("335577")
+    page.get_by_text("Verify Code", exact=True).click()
+
+    # Wait for dashboard to confirm successful login.
+    page.wait_for_url(UPLOAD_URL_RE, timeout=LOGIN_TIMEOUT)
+
+
+def goto_upload(page, base_url, verify=False):
+    """Open the upload (chat) page, optionally confirming that its 'Chat' heading is visible."""
+    page.goto(f"{base_url}upload")
+    if verify:
+        expect(page.get_by_role("heading", name="Chat")).to_be_visible()